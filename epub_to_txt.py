@@ -9,20 +9,27 @@ strips HTML markup, and concatenates the resulting text into a single file.
 from __future__ import annotations
 
 import argparse
+import io
 import posixpath
 import re
 import zipfile
 from html import unescape
 from html.parser import HTMLParser
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 import xml.etree.ElementTree as ET
 
+_ENCODING_RE = re.compile(rb'encoding=["\']([^"\']+)["\']', re.IGNORECASE)
+_NAMESPACE_RE = re.compile(r"\{([^}]+)\}")
+_WRITE_BUFFER_SIZE = 1 << 20
+
 
 class SimpleHTMLTextExtractor(HTMLParser):
     """Lightweight HTML-to-text converter suitable for well-formed XHTML."""
 
-    BLOCK_TAGS = {
+    # HTMLParser already lowercases tag names before dispatching, so the
+    # handlers below test membership directly.
+    BLOCK_TAGS = frozenset({
         "p",
         "div",
         "section",
@@ -44,57 +51,47 @@ class SimpleHTMLTextExtractor(HTMLParser):
         "h4",
         "h5",
         "h6",
-    }
-    LINE_BREAK_TAGS = {"br", "hr"}
-
-    def __init__(self) -> None:
-        super().__init__()
-        self._chunks: List[str] = []
+    })
+    LINE_BREAK_TAGS = frozenset({"br", "hr"})
+
+    def reset(self) -> None:
+        """Clear parser and text state; also called by HTMLParser.__init__."""
+        super().reset()
+        self._buf = io.StringIO()
+        # Line breaks are written lazily, right before the next text run, so
+        # repeated, leading and trailing breaks never reach the buffer.
+        self._pending_newline = False
+        self._need_space = False
 
     def handle_starttag(self, tag: str, attrs: List[tuple[str, Optional[str]]]) -> None:
-        tag = tag.lower()
         if tag in self.LINE_BREAK_TAGS:
-            self._append("\n")
+            self._break_line()
 
     def handle_endtag(self, tag: str) -> None:
-        tag = tag.lower()
         if tag in self.BLOCK_TAGS:
-            self._append("\n")
+            self._break_line()
 
     def handle_data(self, data: str) -> None:
-        text = unescape(data.replace("\xa0", " "))
-        collapsed = " ".join(text.split())
+        # str.split() treats NBSP like any other Unicode whitespace, so a single
+        # split/join both normalises and collapses the fragment.
+        collapsed = " ".join(unescape(data).split())
         if not collapsed:
             return
-        if self._chunks and not self._chunks[-1].endswith(("\n", " ")):
-            self._chunks.append(" ")
-        self._chunks.append(collapsed)
+        if self._pending_newline:
+            self._buf.write("\n")
+            self._pending_newline = False
+        elif self._need_space:
+            self._buf.write(" ")
+        self._buf.write(collapsed)
+        self._need_space = True
 
     def get_text(self) -> str:
-        raw = "".join(self._chunks)
-        lines = raw.splitlines()
-        cleaned_lines: List[str] = []
-        previous_blank = True
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                if not previous_blank:
-                    cleaned_lines.append("")
-                previous_blank = True
-            else:
-                cleaned_lines.append(stripped)
-                previous_blank = False
-        return "\n".join(cleaned_lines).strip()
-
-    def _append(self, fragment: str) -> None:
-        if not self._chunks:
-            self._chunks.append(fragment)
-            return
-        if fragment == "\n":
-            if not self._chunks[-1].endswith("\n"):
-                self._chunks.append(fragment)
-            return
-        self._chunks.append(fragment)
+        return self._buf.getvalue()
+
+    def _break_line(self) -> None:
+        if self._need_space:
+            self._pending_newline = True
+            self._need_space = False
 
 
 def detect_encoding(payload: bytes, default: str = "utf-8") -> str:
@@ -102,7 +99,7 @@ def detect_encoding(payload: bytes, default: str = "utf-8") -> str:
     if payload.startswith(b"\xef\xbb\xbf"):
         return "utf-8"
     head = payload[:512]
-    match = re.search(rb'encoding=["\']([^"\']+)["\']', head, flags=re.IGNORECASE)
+    match = _ENCODING_RE.search(head)
     if match:
         candidate = match.group(1).decode("ascii", errors="ignore").strip()
         if candidate:
@@ -118,9 +115,14 @@ def decode_bytes(payload: bytes) -> str:
         return payload.decode("utf-8", errors="ignore")
 
 
-def extract_text_from_markup(payload: bytes) -> str:
+def extract_text_from_markup(
+    payload: bytes, extractor: Optional[SimpleHTMLTextExtractor] = None
+) -> str:
     text = decode_bytes(payload)
-    extractor = SimpleHTMLTextExtractor()
+    if extractor is None:
+        extractor = SimpleHTMLTextExtractor()
+    else:
+        extractor.reset()
     extractor.feed(text)
     extractor.close()
     return extractor.get_text()
@@ -128,12 +130,10 @@ def extract_text_from_markup(payload: bytes) -> str:
 
 def locate_opf(zip_file: zipfile.ZipFile) -> str:
     try:
-        with zip_file.open("META-INF/container.xml") as container:
-            tree = ET.parse(container)
+        root = ET.fromstring(zip_file.read("META-INF/container.xml"))
     except KeyError as exc:
         raise ValueError("Container definition META-INF/container.xml not found.") from exc
 
-    root = tree.getroot()
     namespace_map = {"container": "urn:oasis:names:tc:opendocument:xmlns:container"}
     rootfile = root.find(".//container:rootfile", namespace_map)
     if rootfile is None:
@@ -144,16 +144,18 @@ def locate_opf(zip_file: zipfile.ZipFile) -> str:
     return opf_path
 
 
-def build_manifest(package_root: ET.Element, ns: str) -> Dict[str, Dict[str, str]]:
-    def tag(name: str) -> str:
-        return f"{{{ns}}}{name}" if ns else name
+def qualify_tag(ns: str, name: str) -> str:
+    """Return the Clark-notation tag name used by ElementTree for `name` in `ns`."""
+    return f"{{{ns}}}{name}" if ns else name
+
 
-    manifest_element = package_root.find(tag("manifest"))
+def build_manifest(package_root: ET.Element, ns: str) -> Dict[str, Dict[str, str]]:
+    manifest_element = package_root.find(qualify_tag(ns, "manifest"))
     if manifest_element is None:
         raise ValueError("OPF manifest section not found.")
 
     manifest: Dict[str, Dict[str, str]] = {}
-    for item in manifest_element.findall(tag("item")):
+    for item in manifest_element.findall(qualify_tag(ns, "item")):
         item_id = item.attrib.get("id")
         href = item.attrib.get("href")
         if not item_id or not href:
@@ -166,14 +168,11 @@ def build_manifest(package_root: ET.Element, ns: str) -> Dict[str, Dict[str, str
 
 
 def iter_spine_itemrefs(package_root: ET.Element, ns: str) -> Iterable[str]:
-    def tag(name: str) -> str:
-        return f"{{{ns}}}{name}" if ns else name
-
-    spine = package_root.find(tag("spine"))
+    spine = package_root.find(qualify_tag(ns, "spine"))
     if spine is None:
         raise ValueError("OPF spine section not found.")
 
-    for itemref in spine.findall(tag("itemref")):
+    for itemref in spine.findall(qualify_tag(ns, "itemref")):
         if itemref.attrib.get("linear", "yes").lower() == "no":
             continue
         idref = itemref.attrib.get("idref")
@@ -190,15 +189,14 @@ def normalize_member_path(opf_path: str, href: str) -> str:
     return posixpath.normpath(posixpath.join(opf_dir, href))
 
 
-def extract_spine_text(zip_file: zipfile.ZipFile, opf_path: str) -> List[str]:
-    with zip_file.open(opf_path) as opf:
-        package_tree = ET.parse(opf)
-    package_root = package_tree.getroot()
-    namespace_match = re.match(r"\{([^}]+)\}", package_root.tag)
+def iter_spine_text(zip_file: zipfile.ZipFile, opf_path: str) -> Iterator[str]:
+    """Yield the cleaned text of each non-empty spine item in reading order."""
+    package_root = ET.fromstring(zip_file.read(opf_path))
+    namespace_match = _NAMESPACE_RE.match(package_root.tag)
     namespace = namespace_match.group(1) if namespace_match else ""
 
     manifest = build_manifest(package_root, namespace)
-    sections: List[str] = []
+    extractor = SimpleHTMLTextExtractor()
 
     for item_id in iter_spine_itemrefs(package_root, namespace):
         manifest_entry = manifest.get(item_id)
@@ -209,24 +207,18 @@ def extract_spine_text(zip_file: zipfile.ZipFile, opf_path: str) -> List[str]:
             continue
         member_path = normalize_member_path(opf_path, manifest_entry["href"])
         try:
-            with zip_file.open(member_path) as item_file:
-                payload = item_file.read()
+            payload = zip_file.read(member_path)
         except KeyError:
             continue
 
         if media_type == "text/plain":
             text_content = decode_bytes(payload)
         else:
-            text_content = extract_text_from_markup(payload)
+            text_content = extract_text_from_markup(payload, extractor)
 
         cleaned = text_content.strip()
         if cleaned:
-            sections.append(cleaned)
-
-    if not sections:
-        raise ValueError("No textual spine items found in the EPUB package.")
-
-    return sections
+            yield cleaned
 
 
 def convert_epub_to_txt(epub_path: Path, destination: Optional[Path] = None) -> Path:
@@ -234,15 +226,32 @@ def convert_epub_to_txt(epub_path: Path, destination: Optional[Path] = None) ->
     if not epub_path.is_file():
         raise FileNotFoundError(f"EPUB file not found: {epub_path}")
 
+    output_path = destination or epub_path.with_suffix(".txt")
+
     with zipfile.ZipFile(epub_path) as zf:
         opf_path = locate_opf(zf)
-        sections = extract_spine_text(zf, opf_path)
-
-    final_text = "\n\n".join(sections)
-
-    output_path = destination or epub_path.with_suffix(".txt")
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(final_text + "\n", encoding="utf-8")
+        sections = iter_spine_text(zf, opf_path)
+        # Pull the first section before touching the destination so that a
+        # book without text fails without leaving an empty file behind.
+        first_section = next(sections, None)
+        if first_section is None:
+            raise ValueError("No textual spine items found in the EPUB package.")
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        # Sections are streamed, so a broken item can still fail midway; write
+        # to a sibling file and only replace the destination once all is in.
+        partial_path = output_path.with_name(output_path.name + ".part")
+        try:
+            with partial_path.open("w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as out:
+                out.write(first_section)
+                for section in sections:
+                    out.write("\n\n")
+                    out.write(section)
+                out.write("\n")
+            partial_path.replace(output_path)
+        except BaseException:
+            partial_path.unlink(missing_ok=True)
+            raise
     return output_path
 
 
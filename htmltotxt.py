@@ -1,6 +1,7 @@
 import os
 import re
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from bs4 import BeautifulSoup, SoupStrainer
 
 # НАСТРОЙКИ
 # Путь к папке с экспортированным чатом Telegram.
@@ -14,27 +15,101 @@ OUTPUT_FOLDER = "d:/results/Affiliatka&aishka to txt/"
 # Это создаст больше файлов, но они гарантированно загрузятся.
 WORDS_PER_FILE_LIMIT = 50000 
 
+# Парсер для BeautifulSoup: "lxml" написан на C и в разы быстрее,
+# встроенный "html.parser" используется, если lxml не установлен.
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Строим дерево только для блоков сообщений: меню, заголовки и скрипты
+# страницы пропускаются ещё на этапе разбора.
+def has_message_class(value):
+    # Новые версии bs4 передают сюда всю строку class ("message default clearfix"),
+    # старые - отдельные классы, поэтому строка разбивается явно.
+    if not value:
+        return False
+    classes = value.split() if isinstance(value, str) else value
+    return 'message' in classes
+
+MESSAGE_STRAINER = SoupStrainer('div', class_=has_message_class)
+
+# Буфер записи (1 МБ) и разделитель между сообщениями
+WRITE_BUFFER_SIZE = 1 << 20
+SEPARATOR = "-" * 20 + "\n"
+
+MESSAGES_FILE_RE = re.compile(r'messages(\d+)\.html')
+
 def get_file_number(filename):
     if filename == "messages.html":
         return 1
-    match = re.search(r'messages(\d+)\.html', filename)
+    match = MESSAGES_FILE_RE.match(filename)
     return int(match.group(1)) if match else 0
 
 def clean_text(text):
     return text.strip() if text else ""
 
+def find_message_parts(msg):
+    # Один проход по вложенным div вместо отдельного find() на каждый блок.
+    # Для каждого класса берётся первый div в порядке документа, как и у find().
+    body = date_div = from_name_div = text_div = None
+    for node in msg.descendants:
+        if node.name != 'div':
+            continue
+        classes = node.get('class') or []
+        if body is None and 'body' in classes:
+            body = node
+        if date_div is None and ' '.join(classes) == 'pull_right date details':
+            date_div = node
+        if from_name_div is None and 'from_name' in classes:
+            from_name_div = node
+        if text_div is None and 'text' in classes:
+            text_div = node
+        if all(part is not None for part in (body, date_div, from_name_div, text_div)):
+            break
+    return body, date_div, from_name_div, text_div
+
 def count_words(text):
     # Грубый подсчет слов (по пробелам)
     return len(text.split())
 
+def parse_file(file_path):
+    # Разбирает один HTML-файл (выполняется в отдельном процессе).
+    # Возвращает список (дата, автор, текст, слов) и текст ошибки, если она была;
+    # сообщения, прочитанные до ошибки, сохраняются.
+    entries = []
+    try:
+        with open(file_path, 'r', encoding='utf-8') as html_file:
+            # Файл читается целиком одним вызовом
+            markup = html_file.read()
+            soup = BeautifulSoup(markup, HTML_PARSER, parse_only=MESSAGE_STRAINER)
+            messages = soup.find_all('div', class_='message')
+            
+            for msg in messages:
+                body, date_div, from_name_div, text_div = find_message_parts(msg)
+                if body is None:
+                    continue
+
+                # Данные
+                date = date_div['title'] if date_div and date_div.has_attr('title') else "?"
+                
+                sender = clean_text(from_name_div.text) if from_name_div else "System"
+                
+                if text_div:
+                    text = clean_text(text_div.get_text(separator=" "))
+                    entries.append((date, sender, text, count_words(text)))
+
+    except Exception as e:
+        return entries, str(e)
+    return entries, None
+
 def main():
     # Определяем рабочую директорию
     work_dir = CHAT_FOLDER if CHAT_FOLDER else '.'
     
     # Создаем папку для результатов, если её нет
-    if not os.path.exists(OUTPUT_FOLDER):
-        os.makedirs(OUTPUT_FOLDER)
-        print(f"Создана папка для результатов: {OUTPUT_FOLDER}")
+    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
     
     files = [f for f in os.listdir(work_dir) if f.startswith('messages') and f.endswith('.html')]
     files.sort(key=get_file_number)
@@ -46,50 +121,32 @@ def main():
     
     # Создаем первый файл в папке результатов
     current_file_name = os.path.join(OUTPUT_FOLDER, f"{BASE_FILENAME}_{current_part}.txt")
-    outfile = open(current_file_name, 'w', encoding='utf-8-sig')
+    outfile = open(current_file_name, 'w', encoding='utf-8-sig', buffering=WRITE_BUFFER_SIZE)
     
     print(f"Пишем в {current_file_name}...")
 
-    for file_name in files:
-        file_path = os.path.join(work_dir, file_name)
-        try:
-            with open(file_path, 'r', encoding='utf-8') as html_file:
-                soup = BeautifulSoup(html_file, 'html.parser')
-                messages = soup.find_all('div', class_='message')
+    # Файлы разбираются параллельно, а результаты приходят в исходном порядке,
+    # так что нарезка на части остаётся последовательной
+    file_paths = [os.path.join(work_dir, file_name) for file_name in files]
+    with ProcessPoolExecutor() as executor:
+        for file_name, (entries, error) in zip(files, executor.map(parse_file, file_paths)):
+            for date, sender, text, entry_words in entries:
+                # ПРОВЕРКА: Если добавив это сообщение, мы превысим лимит -> режем
+                if current_word_count + entry_words > WORDS_PER_FILE_LIMIT:
+                    outfile.close()
+                    print(f"--- Файл {current_file_name} готов. Слов: {current_word_count}")
+                    
+                    current_part += 1
+                    current_word_count = 0
+                    current_file_name = os.path.join(OUTPUT_FOLDER, f"{BASE_FILENAME}_{current_part}.txt")
+                    outfile = open(current_file_name, 'w', encoding='utf-8-sig', buffering=WRITE_BUFFER_SIZE)
+                    print(f"Пишем в {current_file_name}...")
                 
-                for msg in messages:
-                    if not msg.find('div', class_='body'):
-                        continue
+                outfile.write(f"[{date}] {sender}: {text}\n{SEPARATOR}")
+                current_word_count += entry_words
 
-                    # Данные
-                    date_div = msg.find('div', class_='pull_right date details')
-                    date = date_div['title'] if date_div and date_div.has_attr('title') else "?"
-                    
-                    from_name_div = msg.find('div', class_='from_name')
-                    sender = clean_text(from_name_div.text) if from_name_div else "System"
-                    
-                    text_div = msg.find('div', class_='text')
-                    if text_div:
-                        text = clean_text(text_div.get_text(separator=" "))
-                        entry_words = count_words(text)
-                        
-                        # ПРОВЕРКА: Если добавив это сообщение, мы превысим лимит -> режем
-                        if current_word_count + entry_words > WORDS_PER_FILE_LIMIT:
-                            outfile.close()
-                            print(f"--- Файл {current_file_name} готов. Слов: {current_word_count}")
-                            
-                            current_part += 1
-                            current_word_count = 0
-                            current_file_name = os.path.join(OUTPUT_FOLDER, f"{BASE_FILENAME}_{current_part}.txt")
-                            outfile = open(current_file_name, 'w', encoding='utf-8-sig')
-                            print(f"Пишем в {current_file_name}...")
-                        
-                        outfile.write(f"[{date}] {sender}: {text}\n")
-                        outfile.write("-" * 20 + "\n")
-                        current_word_count += entry_words
-
-        except Exception as e:
-            print(f"Ошибка в файле {file_name}: {e}")
+            if error is not None:
+                print(f"Ошибка в файле {file_name}: {error}")
 
     outfile.close()
     print(f"\nГотово! Чат разбит на {current_part} частей. Загрузите их все в NotebookLM.")
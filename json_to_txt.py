@@ -9,29 +9,45 @@ Usage:
 import argparse
 import json
 from pathlib import Path
-from typing import List
+from typing import Iterator
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; the standard library parser is used instead
+    orjson = None
 
-def extract_text(data) -> List[str]:
-    if isinstance(data, str):
-        return [data]
-    if isinstance(data, dict):
-        texts: List[str] = []
-        for value in data.values():
-            texts.extend(extract_text(value))
-        return texts
-    if isinstance(data, list):
-        texts: List[str] = []
-        for value in data:
-            texts.extend(extract_text(value))
-        return texts
-    return []
+
+def extract_text(data) -> Iterator[str]:
+    """Yield every string value in document order, without recursion."""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, dict):
+            stack.extend(reversed(value.values()))
+        elif isinstance(value, list):
+            stack.extend(reversed(value))
+
+
+def load_json(payload: bytes):
+    """Parse JSON bytes, preferring orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than json (no BOM, NaN or lone surrogates).
+            pass
+    return json.loads(payload)
 
 
 def convert(input_path: Path, output_path: Path) -> None:
-    raw = json.loads(input_path.read_text(encoding="utf-8"))
-    lines = extract_text(raw)
-    output_path.write_text("\n".join(lines), encoding="utf-8")
+    raw = load_json(input_path.read_bytes())
+    with output_path.open("w", encoding="utf-8") as out:
+        for index, text in enumerate(extract_text(raw)):
+            if index:
+                out.write("\n")
+            out.write(text)
 
 
 def parse_args() -> argparse.Namespace:
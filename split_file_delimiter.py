@@ -23,7 +23,13 @@ Usage:
     Example: python split_file.py my_large_file.txt -d "-- Chat:" "-- New:" -o split_files
 """
 import os
+import sys
+import re
+import mmap
 import argparse
+from collections import deque
+from itertools import accumulate
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # --- CONFIGURATION / НАСТРОЙКИ ---
 # Путь к файлу или папке, которую нужно разделить.
@@ -47,116 +53,285 @@ SPLIT_VALUE = 50000
 DELIMITER = ["-- Chat:", "=== Project:", "### Account:"]
 # ---------------------------------
 
+# Размер буфера чтения/записи (1 МБ)
+IO_BUFFER_SIZE = 1 << 20
+
+# os.sendfile() copies between regular files only on Linux (as in shutil)
+USE_SENDFILE = sys.platform.startswith('linux')
+
+# Output parts of known size are preallocated where the OS supports it
+HAS_FALLOCATE = hasattr(os, 'posix_fallocate')
+# Smaller parts are not preallocated: there is little to gain, and where the
+# filesystem has no fallocate, glibc emulates it by writing to every block
+FALLOCATE_MIN_SIZE = 1 << 20
+
+# Сколько готовых частей может ждать записи в фоновом потоке
+MAX_PENDING_WRITES = 2
+
+# Размер блока для подсчёта слов (64 КБ)
+WORD_BLOCK_SIZE = 1 << 16
+
+# Maps ASCII whitespace (what bytes.split() splits on) to b' ' and every other byte to b'x'
+WORD_TABLE = bytes(32 if chr(i) in ' \t\n\r\x0b\x0c' else 120 for i in range(256))
+
 def split_file_by_lines(filepath, lines_per_file, output_dir):
     """Splits a file into multiple files of a specified number of lines."""
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    output_template = part_template(filepath, output_dir)
 
-    with open(filepath, 'r', encoding='utf-8') as f:
+    with open(filepath, 'rb', buffering=IO_BUFFER_SIZE) as f, ThreadPoolExecutor(max_workers=1) as writer:
+        queued_writes = deque()
         file_count = 1
-        lines = []
+        buf = bytearray()
+        line_count = 0
         for line in f:
-            lines.append(line)
-            if len(lines) >= lines_per_file:
-                write_part(filepath, file_count, lines, output_dir)
-                lines = []
+            buf += line
+            line_count += 1
+            if line_count >= lines_per_file:
+                write_part_behind(writer, queued_writes, output_template, file_count, buf)
+                buf.clear()
+                line_count = 0
                 file_count += 1
-        if lines:
-            write_part(filepath, file_count, lines, output_dir)
+        if buf:
+            write_part_behind(writer, queued_writes, output_template, file_count, buf)
+        finish_writes(queued_writes)
 
 def split_file_by_bytes(filepath, bytes_per_file, output_dir):
     """Splits a file into multiple files of a specified byte size."""
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    output_template = part_template(filepath, output_dir)
 
-    with open(filepath, 'r', encoding='utf-8') as f:
+    if os.path.getsize(filepath) == 0:
+        return
+
+    # Parts end on line boundaries, so each cut is one search for the last newline
+    # that still fits; the parts are then copied as byte ranges of the input
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        size = len(data)
         file_count = 1
-        lines = []
-        current_bytes = 0
-        for line in f:
-            line_bytes = len(line.encode('utf-8'))
-            if current_bytes + line_bytes > bytes_per_file and lines:
-                write_part(filepath, file_count, lines, output_dir)
-                lines = []
-                current_bytes = 0
-                file_count += 1
-            lines.append(line)
-            current_bytes += line_bytes
-        if lines:
-            write_part(filepath, file_count, lines, output_dir)
+        part_start = 0
+        while part_start < size:
+            part_limit = part_start + bytes_per_file
+            if part_limit >= size:
+                part_end = size
+            else:
+                # The last line that ends within the limit closes the part...
+                part_end = data.rfind(b'\n', part_start, part_limit) + 1
+                if not part_end:
+                    # ...unless the first line alone is longer: then it is a part of its own
+                    part_end = data.find(b'\n', part_start) + 1 or size
+            copy_part(output_template, file_count, f, part_start, part_end)
+            part_start = part_end
+            file_count += 1
+
+def count_words(data):
+    """Counts the words in a bytes buffer exactly as len(data.split()) would, without building a list."""
+    marked = data.translate(WORD_TABLE)
+    # Every word starts either at the beginning of the buffer or right after whitespace
+    return marked.count(b' x') + marked.startswith(b'x')
+
+def count_words_between(data, start, end):
+    """
+    Counts the words in data[start:end] block by block, so a long section of
+    a mapped file is never copied out whole.
+    """
+    words = 0
+    while start < end:
+        # A block of whole lines: words never span a newline, so the counts add up
+        block_end = min(start + WORD_BLOCK_SIZE, end)
+        if block_end < end and data[block_end - 1] != 0x0a:
+            newline = data.find(b'\n', block_end, end)
+            block_end = end if newline == -1 else newline + 1
+        words += count_words(data[start:block_end])
+        start = block_end
+    return words
 
 def split_file_by_words(filepath, words_per_file, output_dir):
     """
     Splits a file into multiple files of a specified number of words.
     If DELIMITER is set, respects delimiter boundaries - splits happen at delimiters.
     """
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    output_template = part_template(filepath, output_dir)
     
     # Check if we should respect delimiter boundaries
     use_delimiters = DELIMITER and len(DELIMITER) > 0
-    
-    def line_contains_delimiter(line):
-        if not use_delimiters:
-            return False
-        return any(d in line for d in DELIMITER)
-    
-    def find_prev_non_empty_line_is_delimiter(all_lines, idx):
-        """Check if the previous non-empty line is a delimiter."""
-        prev_idx = idx - 1
-        while prev_idx >= 0 and all_lines[prev_idx].strip() == '':
-            prev_idx -= 1
-        if prev_idx < 0:
-            return False
-        return line_contains_delimiter(all_lines[prev_idx])
-    
-    # Read all lines first (needed for delimiter-aware splitting)
-    with open(filepath, 'r', encoding='utf-8') as f:
-        all_lines = f.readlines()
-    
-    if not all_lines:
+    if use_delimiters:
+        split_words_at_delimiters(filepath, words_per_file, output_template)
         return
     
-    file_count = 1
-    current_chunk = []
-    current_words = 0
-    i = 0
-    
-    while i < len(all_lines):
-        line = all_lines[i]
-        line_words = len(line.split())
-        is_delim = line_contains_delimiter(line)
+    with open(filepath, 'rb', buffering=IO_BUFFER_SIZE) as f, ThreadPoolExecutor(max_workers=1) as writer:
+        queued_writes = deque()
+        file_count = 1
+        buf = bytearray()
+        current_words = 0
         
-        # Check if this delimiter starts a new logical section
-        # (i.e., previous non-empty line is content, not another delimiter)
-        is_split_point = False
-        if use_delimiters and is_delim and i > 0:
-            is_split_point = not find_prev_non_empty_line_is_delimiter(all_lines, i)
+        while True:
+            # Read a block of whole lines
+            block = f.read(WORD_BLOCK_SIZE)
+            if not block:
+                break
+            if not block.endswith(b'\n'):
+                block += f.readline()
+            
+            # Blocks that fit into the current part are taken whole; a block
+            # that does not is halved at a line boundary until single lines remain
+            pending = [(block, count_words(block))]
+            while pending:
+                chunk, chunk_words = pending.pop()
+                if current_words + chunk_words <= words_per_file:
+                    buf += chunk
+                    current_words += chunk_words
+                    continue
+                
+                middle = chunk.find(b'\n', len(chunk) // 2) + 1
+                if not 0 < middle < len(chunk):
+                    middle = chunk.rfind(b'\n', 0, len(chunk) // 2) + 1
+                if middle:
+                    # Halves split at a newline, so their word counts add up to the chunk's
+                    head = chunk[:middle]
+                    head_words = count_words(head)
+                    pending.append((chunk[middle:], chunk_words - head_words))
+                    pending.append((head, head_words))
+                    continue
+                
+                # A single line that does not fit starts a new part
+                if buf:
+                    write_part_behind(writer, queued_writes, output_template, file_count, buf)
+                    buf.clear()
+                    current_words = 0
+                    file_count += 1
+                buf += chunk
+                current_words += chunk_words
         
-        # If we've exceeded word limit and hit a split point, save current chunk
-        if current_words >= words_per_file and is_split_point and current_chunk:
-            write_part(filepath, file_count, current_chunk, output_dir)
-            current_chunk = []
-            current_words = 0
-            file_count += 1
-            # Don't increment i - we want to include this delimiter in next chunk
-            continue
+        # Write any remaining content
+        if buf:
+            write_part_behind(writer, queued_writes, output_template, file_count, buf)
+        finish_writes(queued_writes)
+
+def split_words_at_delimiters(filepath, words_per_file, output_template):
+    """
+    Word-based splitting that only cuts at delimiter split points:
+    a part is closed at the first split point after it reached `words_per_file` words.
+    Split points come from one scan of the mapped file and words are counted
+    per section between them, so no per-line loop runs in Python.
+    """
+    if os.path.getsize(filepath) == 0:
+        return
+    
+    delimiter_bytes = encode_delimiters(DELIMITER)
+    
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        file_count = 1
+        part_start = 0
+        section_start = 0
+        current_words = 0
         
-        # If no delimiters configured, use simple word-based splitting
-        if not use_delimiters:
-            if current_words + line_words > words_per_file and current_chunk:
-                write_part(filepath, file_count, current_chunk, output_dir)
-                current_chunk = []
+        for point in find_split_points(data, delimiter_bytes):
+            current_words += count_words_between(data, section_start, point)
+            section_start = point
+            # If we've reached the word limit, the part ends right before this split point
+            if current_words >= words_per_file and point > part_start:
+                copy_part(output_template, file_count, f, part_start, point)
+                part_start = point
                 current_words = 0
                 file_count += 1
         
-        current_chunk.append(line)
-        current_words += line_words
-        i += 1
-    
-    # Write any remaining content
-    if current_chunk:
-        write_part(filepath, file_count, current_chunk, output_dir)
+        # Write any remaining content
+        copy_part(output_template, file_count, f, part_start, len(data))
+
+# Matches any non-whitespace byte; a span without a match holds only blank lines
+NON_BLANK_RE = re.compile(rb'\S')
+
+def is_blank(data, start, end):
+    """
+    Checks whether data[start:end] holds only whitespace, the way str.strip() sees it.
+    """
+    # rb'\S' only knows ASCII whitespace; str.strip() also drops \x1c-\x1f and
+    # non-ASCII spaces (NBSP, U+3000, ...), so each hit of that kind is decoded
+    # on its own - one character at a time, the gap itself is never copied
+    pos = start
+    while True:
+        match = NON_BLANK_RE.search(data, pos, end)
+        if match is None:
+            return True
+        pos = match.start()
+        lead = data[pos]
+        if 0x1c <= lead <= 0x1f:
+            pos += 1
+            continue
+        if lead < 0x80:
+            return False  # Any other ASCII byte is content
+        length = 2 if lead < 0xe0 else 3 if lead < 0xf0 else 4
+        try:
+            char = data[pos:min(pos + length, end)].decode('utf-8')
+        except UnicodeDecodeError:
+            pos += 1  # Skip invalid bytes, as decoding with 'ignore' would
+            continue
+        if not char.isspace():
+            return False
+        pos += length
+
+def encode_delimiters(delimiters):
+    """
+    Normalizes delimiter string(s) to a list of UTF-8 byte strings,
+    the form in which they are searched for in the raw file.
+    """
+    if isinstance(delimiters, str):
+        delimiters = [delimiters]
+    # A delimiter is looked for inside a single line, so it can end with '\n'
+    # but never span one - such delimiters match nothing and are dropped here,
+    # otherwise find() over the whole buffer would match them across lines
+    return [
+        d.encode('utf-8') for d in delimiters
+        if '\n' not in d[:-1]
+    ]
+
+def find_delimiter_lines(data, delimiters):
+    """
+    Scans the whole buffer once and returns (start, end) byte offsets
+    of every line containing a delimiter. `end` includes the trailing newline.
+    Each delimiter is located with find() (a C substring search that is much faster
+    than a regex alternation) and its next hit is kept until the scan passes it.
+    """
+    found = []
+    size = len(data)
+    next_hits = [data.find(d) for d in delimiters]
+    pos = 0
+    while pos < size:
+        hits = [hit for hit in next_hits if hit != -1]
+        if not hits:
+            break
+        first_hit = min(hits)
+        start = data.rfind(b'\n', 0, first_hit) + 1
+        end = data.find(b'\n', first_hit)
+        end = size if end == -1 else end + 1
+        found.append((start, end))
+        pos = end
+        # Hits on the line just taken are stale - look for those delimiters again after it
+        next_hits = [
+            data.find(d, pos) if hit != -1 and hit < pos else hit
+            for d, hit in zip(delimiters, next_hits)
+        ]
+    return found
+
+def find_split_points(data, delimiters):
+    """
+    Returns the byte offsets of the delimiter lines that start a new section.
+    A split point is a delimiter line where the previous NON-EMPTY line is NOT a delimiter.
+    """
+    # Delimiter lines are visited in order, so it is enough to remember where the previous
+    # one ended: if only blank lines lie in between, the previous non-empty line is a delimiter.
+    split_points = []
+    prev_delim_end = None
+    for start, end in find_delimiter_lines(data, delimiters):
+        last_nonblank_is_delim = (
+            prev_delim_end is not None
+            and is_blank(data, prev_delim_end, start)
+        )
+        if not last_nonblank_is_delim:
+            # First delimiter, or previous non-empty line is content - this is a split point
+            split_points.append(start)
+        # Otherwise this delimiter is consecutive - not a split point
+        prev_delim_end = end
+    return split_points
 
 def split_file_by_delimiter(filepath, delimiters, output_dir):
     """
@@ -164,6 +339,9 @@ def split_file_by_delimiter(filepath, delimiters, output_dir):
     Each output file starts with delimiter line(s) and ends before the next delimiter.
     Consecutive delimiters are grouped at the beginning of their section.
     
+    The file is memory-mapped and scanned for delimiters in a single pass;
+    sections are copied as byte ranges, so no per-line list is built.
+    
     Args:
         filepath: Path to the input file
         delimiters: A single delimiter string or a list of delimiter strings
@@ -173,110 +351,154 @@ def split_file_by_delimiter(filepath, delimiters, output_dir):
     if isinstance(delimiters, str):
         delimiters = [delimiters]
     
-    def line_contains_delimiter(line):
-        """Check if line contains any of the delimiters."""
-        return any(d in line for d in delimiters)
+    delimiter_bytes = encode_delimiters(delimiters)
     
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    output_template = part_template(filepath, output_dir)
 
-    # Read all lines first
-    with open(filepath, 'r', encoding='utf-8') as f:
-        all_lines = f.readlines()
-    
-    if not all_lines:
+    if os.path.getsize(filepath) == 0:
         print(f"Warning: {filepath} is empty.")
         return
     
-    # Step 1: Find all delimiter line indices
-    delimiter_indices = []
-    for i, line in enumerate(all_lines):
-        if line_contains_delimiter(line):
-            delimiter_indices.append(i)
+    # Map the file instead of reading it: the OS pages it in on demand,
+    # and the regex/find calls below scan the mapping directly
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        # Step 1: Find real split points (where delimiter comes after content, not after another delimiter)
+        split_points = find_split_points(data, delimiter_bytes)
     
-    if not delimiter_indices:
-        # No delimiters found - write entire file as single part
-        write_part(filepath, 1, all_lines, output_dir)
-        print(f"Warning: No delimiters {delimiters} found in {filepath}. File copied as single part.")
-        return
-    
-    # Step 2: Find real split points (where delimiter comes after content, not after another delimiter)
-    # A split point is a delimiter index where the previous NON-EMPTY line is NOT a delimiter
-    split_points = []
-    for idx in delimiter_indices:
-        if idx == 0:
-            # First line is delimiter - this is a split point (start of first section)
-            split_points.append(idx)
-        else:
-            # Find the previous non-empty line (skip blank lines)
-            prev_idx = idx - 1
-            while prev_idx >= 0 and all_lines[prev_idx].strip() == '':
-                prev_idx -= 1
-            
-            if prev_idx < 0:
-                # All previous lines are empty - treat as first content
-                split_points.append(idx)
-            else:
-                # Check if the previous non-empty line is a delimiter
-                prev_is_delim = line_contains_delimiter(all_lines[prev_idx])
-                if not prev_is_delim:
-                    # Previous non-empty line is content - this is a split point
-                    split_points.append(idx)
-                # If previous non-empty line IS a delimiter, this is consecutive - not a split point
+        if not split_points:
+            # No delimiters found - write entire file as single part
+            copy_part(output_template, 1, f, 0, len(data))
+            print(f"Warning: No delimiters {delimiters} found in {filepath}. File copied as single part.")
+            return
     
-    # Step 3: Write sections
-    file_count = 0
+        # Step 2: Write sections
+        file_count = 0
     
-    # Write header (content before first split point) if exists
-    # If the first line is a split point, first_split_idx will be 0, so header will be empty (correct)
-    if split_points:
-        first_split_idx = split_points[0]
-        if first_split_idx > 0:
-            header_lines = all_lines[:first_split_idx]
-            write_part(filepath, file_count, header_lines, output_dir)
+        # Write header (content before first split point) if exists
+        # If the first line is a split point, the header will be empty (correct)
+        if split_points[0] > 0:
+            copy_part(output_template, file_count, f, 0, split_points[0])
             file_count += 1
-    elif not split_points and all_lines:
-         # No split points found but file has content - treat as single part header
-         write_part(filepath, 1, all_lines, output_dir)
-         return
     
-    # Write each section (from one split point to the next)
-    for i, start_idx in enumerate(split_points):
-        if i + 1 < len(split_points):
-            end_idx = split_points[i + 1]
-        else:
-            end_idx = len(all_lines)
-        
-        section_lines = all_lines[start_idx:end_idx]
-        if section_lines:
+        # Write each section (from one split point to the next)
+        bounds = split_points + [len(data)]
+        for start, end in zip(bounds, bounds[1:]):
             file_count += 1
-            write_part(filepath, file_count, section_lines, output_dir)
+            copy_part(output_template, file_count, f, start, end)
 
-def write_part(original_filepath, part_number, lines, output_dir):
-    """Writes a part of the file to a new file."""
+def part_template(original_filepath, output_dir):
+    """
+    Returns a str.format() template for the output paths of a file's parts.
+    Built once per input file, so the path is not parsed again for every part.
+    """
     base, ext = os.path.splitext(os.path.basename(original_filepath))
-    output_filename = os.path.join(output_dir, f"{base}_part_{part_number}{ext}")
-    with open(output_filename, 'w', encoding='utf-8') as out_file:
-        out_file.writelines(lines)
+    prefix = os.path.join(output_dir, f"{base}_part_")
+    # Braces in the path itself must not be taken for replacement fields
+    prefix = prefix.replace('{', '{{').replace('}', '}}')
+    return prefix + '{}' + ext.replace('{', '{{').replace('}', '}}')
+
+def write_part(output_template, part_number, data):
+    """Writes a part of the file (a bytes-like buffer) to a new file."""
+    output_filename = output_template.format(part_number)
+    # One write: large buffers go straight to the OS, bypassing the file buffer
+    with open(output_filename, 'wb', buffering=IO_BUFFER_SIZE) as out_file:
+        out_file.write(data)
+    print(f"Created {output_filename}")
+
+def write_part_behind(writer, queued_writes, output_template, part_number, data):
+    """
+    Hands a part to the background writer thread, so reading goes on while it is written.
+    The data is copied, so the caller may reuse its buffer. At most MAX_PENDING_WRITES
+    parts are queued; beyond that, this waits for the oldest one.
+    """
+    if len(queued_writes) >= MAX_PENDING_WRITES:
+        queued_writes.popleft().result()
+    queued_writes.append(writer.submit(write_part, output_template, part_number, bytes(data)))
+
+def finish_writes(queued_writes):
+    """Waits for all queued part writes and re-raises any error from them."""
+    while queued_writes:
+        queued_writes.popleft().result()
+
+def copy_part(output_template, part_number, src_file, start, end):
+    """Copies bytes [start, end) of an open input file to a new part file."""
+    output_filename = output_template.format(part_number)
+    part_size = end - start
+    # sendfile writes to the descriptor itself, so only the read/write fallback needs a buffer
+    buffering = 0 if USE_SENDFILE else IO_BUFFER_SIZE
+    with open(output_filename, 'wb', buffering=buffering) as out_file:
+        preallocated = False
+        if HAS_FALLOCATE and part_size >= FALLOCATE_MIN_SIZE:
+            # Reserve the whole part at once so the filesystem can allocate it contiguously
+            try:
+                os.posix_fallocate(out_file.fileno(), 0, part_size)
+                preallocated = True
+            except OSError:
+                pass  # Refused (e.g. a libc without emulation) - just write the part
+        if USE_SENDFILE:
+            # The kernel copies the range directly, without passing it through Python
+            out_fd, in_fd = out_file.fileno(), src_file.fileno()
+            while start < end:
+                sent = os.sendfile(out_fd, in_fd, start, end - start)
+                if sent == 0:
+                    break  # The input is shorter than expected
+                start += sent
+        else:
+            src_file.seek(start)
+            while start < end:
+                chunk = src_file.read(min(IO_BUFFER_SIZE, end - start))
+                if not chunk:
+                    break
+                out_file.write(chunk)
+                start += len(chunk)
+        if preallocated and start < end:
+            # The input was shorter than expected - drop the unused preallocated tail
+            out_file.flush()
+            os.ftruncate(out_file.fileno(), part_size - (end - start))
     print(f"Created {output_filename}")
 
 def split_file_into_parts(filepath, num_parts, output_dir):
     """Splits a file into a specified number of equal parts."""
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    output_template = part_template(filepath, output_dir)
 
-    with open(filepath, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    
-    total_lines = len(lines)
-    lines_per_part = (total_lines + num_parts - 1) // num_parts  # Ceiling division
+    # No parts asked for - nothing to write (and the boundary step below must be positive)
+    if num_parts < 1 or os.path.getsize(filepath) == 0:
+        return
 
-    for i in range(num_parts):
-        start = i * lines_per_part
-        end = start + lines_per_part
-        part_lines = lines[start:end]
-        if part_lines:
-            write_part(filepath, i + 1, part_lines, output_dir)
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        # First pass: count lines block by block over the mapping
+        file_size = len(data)
+        block_newlines = [
+            data[pos:pos + IO_BUFFER_SIZE].count(b'\n')
+            for pos in range(0, file_size, IO_BUFFER_SIZE)
+        ]
+        total_lines = sum(block_newlines)
+        if data[-1:] != b'\n':
+            total_lines += 1  # Last line without a trailing newline
+
+        lines_per_part = (total_lines + num_parts - 1) // num_parts  # Ceiling division
+
+        # Find the byte offset after every `lines_per_part`-th newline;
+        # only the blocks that contain such a boundary are looked at again
+        bounds = [0]
+        next_bound = lines_per_part
+        newlines_before = 0
+        for index, newlines in enumerate(block_newlines):
+            if next_bound <= newlines_before + newlines:
+                block_start = index * IO_BUFFER_SIZE
+                block = data[block_start:block_start + IO_BUFFER_SIZE]
+                # Offsets right after each newline of the block, from a single split
+                line_ends = list(accumulate(len(line) + 1 for line in block.split(b'\n')))
+                while next_bound <= newlines_before + newlines:
+                    bounds.append(block_start + line_ends[next_bound - newlines_before - 1])
+                    next_bound += lines_per_part
+            newlines_before += newlines
+        if bounds[-1] < file_size:
+            bounds.append(file_size)
+
+        # Second pass: copy each part's byte range straight to its file
+        for part_number, (start, end) in enumerate(zip(bounds, bounds[1:]), 1):
+            copy_part(output_template, part_number, f, start, end)
 
 def process_path(input_path, output_dir, method_func, method_arg):
     """
@@ -286,19 +508,27 @@ def process_path(input_path, output_dir, method_func, method_arg):
         print("Error: Input path is not specified.")
         return
 
+    # The output directory is created once per run, and only after the input
+    # has been validated; the split functions and the workers expect it to exist
     if os.path.isfile(input_path):
+        os.makedirs(output_dir, exist_ok=True)
         method_func(input_path, method_arg, output_dir)
     elif os.path.isdir(input_path):
-        # Iterate over files in the directory
-        files_found = False
-        for filename in os.listdir(input_path):
-            filepath = os.path.join(input_path, filename)
-            if os.path.isfile(filepath):
-                files_found = True
-                print(f"Processing {filepath}...")
-                method_func(filepath, method_arg, output_dir)
-        if not files_found:
+        # scandir already knows each entry's type, so no extra stat per file
+        with os.scandir(input_path) as entries:
+            filepaths = [entry.path for entry in entries if entry.is_file()]
+        if not filepaths:
             print(f"No files found in directory: {input_path}")
+            return
+        os.makedirs(output_dir, exist_ok=True)
+        # Files are split independently of each other, one worker process per core
+        with ProcessPoolExecutor() as executor:
+            futures = []
+            for filepath in filepaths:
+                print(f"Processing {filepath}...")
+                futures.append(executor.submit(method_func, filepath, method_arg, output_dir))
+            for future in futures:
+                future.result()  # Re-raise errors from the workers
     else:
         print(f"Error: {input_path} is not a valid file or directory.")
 
@@ -20,7 +20,12 @@ Usage:
     Example: python split_file_simple.py my_large_file.txt --words 50000 -o split_files
 """
 import os
+import sys
+import mmap
 import argparse
+from collections import deque
+from itertools import accumulate
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # --- CONFIGURATION / НАСТРОЙКИ ---
 # Путь к файлу или папке, которую нужно разделить.
@@ -38,94 +43,246 @@ SPLIT_METHOD = "words"
 SPLIT_VALUE = 50000
 # ---------------------------------
 
+# Размер буфера чтения/записи (1 МБ)
+IO_BUFFER_SIZE = 1 << 20
+
+# os.sendfile() copies between regular files only on Linux (as in shutil)
+USE_SENDFILE = sys.platform.startswith('linux')
+
+# Output parts of known size are preallocated where the OS supports it
+HAS_FALLOCATE = hasattr(os, 'posix_fallocate')
+# Smaller parts are not preallocated: there is little to gain, and where the
+# filesystem has no fallocate, glibc emulates it by writing to every block
+FALLOCATE_MIN_SIZE = 1 << 20
+
+# Сколько готовых частей может ждать записи в фоновом потоке
+MAX_PENDING_WRITES = 2
+
+# Размер блока для подсчёта слов (64 КБ)
+WORD_BLOCK_SIZE = 1 << 16
+
+# Maps ASCII whitespace (what bytes.split() splits on) to b' ' and every other byte to b'x'
+WORD_TABLE = bytes(32 if chr(i) in ' \t\n\r\x0b\x0c' else 120 for i in range(256))
+
 def split_file_by_lines(filepath, lines_per_file, output_dir):
     """Splits a file into multiple files of a specified number of lines."""
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    output_template = part_template(filepath, output_dir)
 
-    with open(filepath, 'r', encoding='utf-8') as f:
+    with open(filepath, 'rb', buffering=IO_BUFFER_SIZE) as f, ThreadPoolExecutor(max_workers=1) as writer:
+        queued_writes = deque()
         file_count = 1
-        lines = []
+        buf = bytearray()
+        line_count = 0
         for line in f:
-            lines.append(line)
-            if len(lines) >= lines_per_file:
-                write_part(filepath, file_count, lines, output_dir)
-                lines = []
+            buf += line
+            line_count += 1
+            if line_count >= lines_per_file:
+                write_part_behind(writer, queued_writes, output_template, file_count, buf)
+                buf.clear()
+                line_count = 0
                 file_count += 1
-        if lines:
-            write_part(filepath, file_count, lines, output_dir)
+        if buf:
+            write_part_behind(writer, queued_writes, output_template, file_count, buf)
+        finish_writes(queued_writes)
 
 def split_file_by_bytes(filepath, bytes_per_file, output_dir):
     """Splits a file into multiple files of a specified byte size."""
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    output_template = part_template(filepath, output_dir)
+
+    if os.path.getsize(filepath) == 0:
+        return
 
-    with open(filepath, 'r', encoding='utf-8') as f:
+    # Parts end on line boundaries, so each cut is one search for the last newline
+    # that still fits; the parts are then copied as byte ranges of the input
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        size = len(data)
         file_count = 1
-        lines = []
-        current_bytes = 0
-        for line in f:
-            line_bytes = len(line.encode('utf-8'))
-            if current_bytes + line_bytes > bytes_per_file and lines:
-                write_part(filepath, file_count, lines, output_dir)
-                lines = []
-                current_bytes = 0
-                file_count += 1
-            lines.append(line)
-            current_bytes += line_bytes
-        if lines:
-            write_part(filepath, file_count, lines, output_dir)
+        part_start = 0
+        while part_start < size:
+            part_limit = part_start + bytes_per_file
+            if part_limit >= size:
+                part_end = size
+            else:
+                # The last line that ends within the limit closes the part...
+                part_end = data.rfind(b'\n', part_start, part_limit) + 1
+                if not part_end:
+                    # ...unless the first line alone is longer: then it is a part of its own
+                    part_end = data.find(b'\n', part_start) + 1 or size
+            copy_part(output_template, file_count, f, part_start, part_end)
+            part_start = part_end
+            file_count += 1
+
+def count_words(data):
+    """Counts the words in a bytes buffer exactly as len(data.split()) would, without building a list."""
+    marked = data.translate(WORD_TABLE)
+    # Every word starts either at the beginning of the buffer or right after whitespace
+    return marked.count(b' x') + marked.startswith(b'x')
 
 def split_file_by_words(filepath, words_per_file, output_dir):
     """Splits a file into multiple files of a specified number of words."""
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    output_template = part_template(filepath, output_dir)
     
-    with open(filepath, 'r', encoding='utf-8') as f:
+    with open(filepath, 'rb', buffering=IO_BUFFER_SIZE) as f, ThreadPoolExecutor(max_workers=1) as writer:
+        queued_writes = deque()
         file_count = 1
-        current_chunk = []
+        buf = bytearray()
         current_words = 0
         
-        for line in f:
-            line_words = len(line.split())
+        while True:
+            # Read a block of whole lines
+            block = f.read(WORD_BLOCK_SIZE)
+            if not block:
+                break
+            if not block.endswith(b'\n'):
+                block += f.readline()
             
-            if current_words + line_words > words_per_file and current_chunk:
-                write_part(filepath, file_count, current_chunk, output_dir)
-                current_chunk = []
-                current_words = 0
-                file_count += 1
-            
-            current_chunk.append(line)
-            current_words += line_words
+            # Blocks that fit into the current part are taken whole; a block
+            # that does not is halved at a line boundary until single lines remain
+            pending = [(block, count_words(block))]
+            while pending:
+                chunk, chunk_words = pending.pop()
+                if current_words + chunk_words <= words_per_file:
+                    buf += chunk
+                    current_words += chunk_words
+                    continue
+                
+                middle = chunk.find(b'\n', len(chunk) // 2) + 1
+                if not 0 < middle < len(chunk):
+                    middle = chunk.rfind(b'\n', 0, len(chunk) // 2) + 1
+                if middle:
+                    # Halves split at a newline, so their word counts add up to the chunk's
+                    head = chunk[:middle]
+                    head_words = count_words(head)
+                    pending.append((chunk[middle:], chunk_words - head_words))
+                    pending.append((head, head_words))
+                    continue
+                
+                # A single line that does not fit starts a new part
+                if buf:
+                    write_part_behind(writer, queued_writes, output_template, file_count, buf)
+                    buf.clear()
+                    current_words = 0
+                    file_count += 1
+                buf += chunk
+                current_words += chunk_words
         
         # Write any remaining content
-        if current_chunk:
-            write_part(filepath, file_count, current_chunk, output_dir)
+        if buf:
+            write_part_behind(writer, queued_writes, output_template, file_count, buf)
+        finish_writes(queued_writes)
 
 def split_file_into_parts(filepath, num_parts, output_dir):
     """Splits a file into a specified number of equal parts."""
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    output_template = part_template(filepath, output_dir)
 
-    with open(filepath, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    
-    total_lines = len(lines)
-    lines_per_part = (total_lines + num_parts - 1) // num_parts  # Ceiling division
-
-    for i in range(num_parts):
-        start = i * lines_per_part
-        end = start + lines_per_part
-        part_lines = lines[start:end]
-        if part_lines:
-            write_part(filepath, i + 1, part_lines, output_dir)
-
-def write_part(original_filepath, part_number, lines, output_dir):
-    """Writes a part of the file to a new file."""
+    # No parts asked for - nothing to write (and the boundary step below must be positive)
+    if num_parts < 1 or os.path.getsize(filepath) == 0:
+        return
+
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        # First pass: count lines block by block over the mapping
+        file_size = len(data)
+        block_newlines = [
+            data[pos:pos + IO_BUFFER_SIZE].count(b'\n')
+            for pos in range(0, file_size, IO_BUFFER_SIZE)
+        ]
+        total_lines = sum(block_newlines)
+        if data[-1:] != b'\n':
+            total_lines += 1  # Last line without a trailing newline
+
+        lines_per_part = (total_lines + num_parts - 1) // num_parts  # Ceiling division
+
+        # Find the byte offset after every `lines_per_part`-th newline;
+        # only the blocks that contain such a boundary are looked at again
+        bounds = [0]
+        next_bound = lines_per_part
+        newlines_before = 0
+        for index, newlines in enumerate(block_newlines):
+            if next_bound <= newlines_before + newlines:
+                block_start = index * IO_BUFFER_SIZE
+                block = data[block_start:block_start + IO_BUFFER_SIZE]
+                # Offsets right after each newline of the block, from a single split
+                line_ends = list(accumulate(len(line) + 1 for line in block.split(b'\n')))
+                while next_bound <= newlines_before + newlines:
+                    bounds.append(block_start + line_ends[next_bound - newlines_before - 1])
+                    next_bound += lines_per_part
+            newlines_before += newlines
+        if bounds[-1] < file_size:
+            bounds.append(file_size)
+
+        # Second pass: copy each part's byte range straight to its file
+        for part_number, (start, end) in enumerate(zip(bounds, bounds[1:]), 1):
+            copy_part(output_template, part_number, f, start, end)
+
+def part_template(original_filepath, output_dir):
+    """
+    Returns a str.format() template for the output paths of a file's parts.
+    Built once per input file, so the path is not parsed again for every part.
+    """
     base, ext = os.path.splitext(os.path.basename(original_filepath))
-    output_filename = os.path.join(output_dir, f"{base}_part_{part_number}{ext}")
-    with open(output_filename, 'w', encoding='utf-8') as out_file:
-        out_file.writelines(lines)
+    prefix = os.path.join(output_dir, f"{base}_part_")
+    # Braces in the path itself must not be taken for replacement fields
+    prefix = prefix.replace('{', '{{').replace('}', '}}')
+    return prefix + '{}' + ext.replace('{', '{{').replace('}', '}}')
+
+def write_part(output_template, part_number, data):
+    """Writes a part of the file (a bytes-like buffer) to a new file."""
+    output_filename = output_template.format(part_number)
+    # One write: large buffers go straight to the OS, bypassing the file buffer
+    with open(output_filename, 'wb', buffering=IO_BUFFER_SIZE) as out_file:
+        out_file.write(data)
+    print(f"Created {output_filename}")
+
+def write_part_behind(writer, queued_writes, output_template, part_number, data):
+    """
+    Hands a part to the background writer thread, so reading goes on while it is written.
+    The data is copied, so the caller may reuse its buffer. At most MAX_PENDING_WRITES
+    parts are queued; beyond that, this waits for the oldest one.
+    """
+    if len(queued_writes) >= MAX_PENDING_WRITES:
+        queued_writes.popleft().result()
+    queued_writes.append(writer.submit(write_part, output_template, part_number, bytes(data)))
+
+def finish_writes(queued_writes):
+    """Waits for all queued part writes and re-raises any error from them."""
+    while queued_writes:
+        queued_writes.popleft().result()
+
+def copy_part(output_template, part_number, src_file, start, end):
+    """Copies bytes [start, end) of an open input file to a new part file."""
+    output_filename = output_template.format(part_number)
+    part_size = end - start
+    # sendfile writes to the descriptor itself, so only the read/write fallback needs a buffer
+    buffering = 0 if USE_SENDFILE else IO_BUFFER_SIZE
+    with open(output_filename, 'wb', buffering=buffering) as out_file:
+        preallocated = False
+        if HAS_FALLOCATE and part_size >= FALLOCATE_MIN_SIZE:
+            # Reserve the whole part at once so the filesystem can allocate it contiguously
+            try:
+                os.posix_fallocate(out_file.fileno(), 0, part_size)
+                preallocated = True
+            except OSError:
+                pass  # Refused (e.g. a libc without emulation) - just write the part
+        if USE_SENDFILE:
+            # The kernel copies the range directly, without passing it through Python
+            out_fd, in_fd = out_file.fileno(), src_file.fileno()
+            while start < end:
+                sent = os.sendfile(out_fd, in_fd, start, end - start)
+                if sent == 0:
+                    break  # The input is shorter than expected
+                start += sent
+        else:
+            src_file.seek(start)
+            while start < end:
+                chunk = src_file.read(min(IO_BUFFER_SIZE, end - start))
+                if not chunk:
+                    break
+                out_file.write(chunk)
+                start += len(chunk)
+        if preallocated and start < end:
+            # The input was shorter than expected - drop the unused preallocated tail
+            out_file.flush()
+            os.ftruncate(out_file.fileno(), part_size - (end - start))
     print(f"Created {output_filename}")
 
 def process_path(input_path, output_dir, method_func, method_arg):
@@ -136,19 +293,27 @@ def process_path(input_path, output_dir, method_func, method_arg):
         print("Error: Input path is not specified.")
         return
 
+    # The output directory is created once per run, and only after the input
+    # has been validated; the split functions and the workers expect it to exist
     if os.path.isfile(input_path):
+        os.makedirs(output_dir, exist_ok=True)
         method_func(input_path, method_arg, output_dir)
     elif os.path.isdir(input_path):
-        # Iterate over files in the directory
-        files_found = False
-        for filename in os.listdir(input_path):
-            filepath = os.path.join(input_path, filename)
-            if os.path.isfile(filepath):
-                files_found = True
-                print(f"Processing {filepath}...")
-                method_func(filepath, method_arg, output_dir)
-        if not files_found:
+        # scandir already knows each entry's type, so no extra stat per file
+        with os.scandir(input_path) as entries:
+            filepaths = [entry.path for entry in entries if entry.is_file()]
+        if not filepaths:
             print(f"No files found in directory: {input_path}")
+            return
+        os.makedirs(output_dir, exist_ok=True)
+        # Files are split independently of each other, one worker process per core
+        with ProcessPoolExecutor() as executor:
+            futures = []
+            for filepath in filepaths:
+                print(f"Processing {filepath}...")
+                futures.append(executor.submit(method_func, filepath, method_arg, output_dir))
+            for future in futures:
+                future.result()  # Re-raise errors from the workers
     else:
         print(f"Error: {input_path} is not a valid file or directory.")
 